@@ -59,11 +59,15 @@ pushd test_workdir
 mv $PATH_TO_OPEN3D_ML/tests .
 pytest tests/test_integration.py
 pytest tests/test_models.py
+pytest tests/test_dataloaders.py
+pytest tests/test_pipelines.py
 
 # now do the same but in dev mode by setting OPEN3D_ML_ROOT
 export OPEN3D_ML_ROOT=$PATH_TO_OPEN3D_ML
 pytest tests/test_integration.py
 pytest tests/test_models.py
+pytest tests/test_dataloaders.py
+pytest tests/test_pipelines.py
 unset OPEN3D_ML_ROOT
 
 popd
@@ -47,7 +47,11 @@ class SemSegRandomSampler(object):
                 idxs = list(idxs) + list(random.choices(idxs, k=diff))
                 idxs = np.asarray(idxs)
             else:
-                idxs = search_tree.query(center_point, k=num_points)[1][0]
+                # The crop is shuffled below, skip sorting the neighbours.
+                idxs = search_tree.query(center_point,
+                                         k=num_points,
+                                         return_distance=False,
+                                         sort_results=False)[0]
             random.shuffle(idxs)
             pc = pc[idxs]
             return pc, idxs, center_point
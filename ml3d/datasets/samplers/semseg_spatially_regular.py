@@ -92,15 +92,17 @@ class SemSegSpatiallyRegularSampler(object):
                         idxs = np.asarray(idxs)
                     else:
                         idxs = search_tree.query(center_point,
-                                                 k=num_points)[1][0]
+                                                 k=num_points,
+                                                 return_distance=False,
+                                                 sort_results=False)[0]
                 n = len(idxs)
                 if n < 2:
                     self.possibilities[cloud_id][center_id] += 0.001
 
             random.shuffle(idxs)
             pc = pc[idxs]
-            dists = np.sum(np.square((pc - center_point).astype(np.float32)),
-                           axis=1)
+            offsets = (pc - center_point).astype(np.float32)
+            dists = np.einsum('ij,ij->i', offsets, offsets)
             delta = np.square(1 - dists / np.max(dists))
             self.possibilities[cloud_id][idxs] += delta
             new_min = float(np.min(self.possibilities[cloud_id]))
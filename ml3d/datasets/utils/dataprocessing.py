@@ -97,11 +97,16 @@ class DataProcessing:
         Returns:
             neighbor_idx: neighboring points indexes, B*N2*k
         """
+        # The search is bound by memory bandwidth, never run it on double
+        # precision coordinates.
+        query_pts = np.ascontiguousarray(query_pts, dtype=np.float32)
+        support_pts = np.ascontiguousarray(support_pts, dtype=np.float32)
+
         neighbor_idx = knn_search(o3c.Tensor.from_numpy(query_pts),
                                   o3c.Tensor.from_numpy(support_pts),
                                   k).numpy()
 
-        return neighbor_idx.astype(np.int32)
+        return neighbor_idx.astype(np.int32, copy=False)
 
     @staticmethod
     def data_aug(xyz, color, labels, idx, num_out):
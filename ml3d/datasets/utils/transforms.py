@@ -110,7 +110,11 @@ def trans_crop_pc(points, feat, labels, search_tree, pick_idx, num_points):
         select_idx = list(select_idx) + list(random.choices(select_idx, k=diff))
         random.shuffle(select_idx)
     else:
-        select_idx = search_tree.query(center_point, k=num_points)[1][0]
+        # The crop is shuffled below, skip sorting the neighbours.
+        select_idx = search_tree.query(center_point,
+                                       k=num_points,
+                                       return_distance=False,
+                                       sort_results=False)[0]
 
     random.shuffle(select_idx)
     select_points = points[select_idx]
@@ -901,9 +901,8 @@ class KPFCNN(BaseModel):
         data['search_tree'] = search_tree
 
         if split in ["test", "testing"]:
-            proj_inds = np.squeeze(
-                search_tree.query(points, return_distance=False))
-            proj_inds = proj_inds.astype(np.int32)
+            proj_inds = DataProcessing.knn_search(sub_points, points, 1)
+            proj_inds = np.squeeze(proj_inds, axis=1)
             data['proj_inds'] = proj_inds
 
         return data
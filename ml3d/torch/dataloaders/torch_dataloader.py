@@ -33,7 +33,7 @@ class TorchDataloader(Dataset):
             dataset: The 3D ML dataset class. You can use the base dataset, sample datasets , or a custom dataset.
             preprocess: The model's preprocess method.
             transform: The model's transform method.
-            use_cache: Indicates if preprocessed data should be cached.
+            use_cache: Indicates if preprocessed data should be cached. Uncached samples are preprocessed by num_preprocess_workers processes from the dataset config, or in the main process if it is 0 (default).
             steps_per_epoch: The number of steps per epoch that indicates the bactches of samples to train. If it is None, then the step number will be the number of samples in the data.
 
         Returns:
@@ -47,15 +47,30 @@ class TorchDataloader(Dataset):
             cache_dir = getattr(dataset.cfg, 'cache_dir')
             assert cache_dir is not None, 'cache directory is not given'
 
+            cache_key = get_hash(repr(preprocess))
             self.cache_convert = Cache(preprocess,
                                        cache_dir=cache_dir,
-                                       cache_key=get_hash(repr(preprocess)))
+                                       cache_key=cache_key)
 
             uncached = [
                 idx for idx in range(len(dataset)) if dataset.get_attr(idx)
                 ['name'] not in self.cache_convert.cached_ids
             ]
-            if len(uncached) > 0:
+            num_workers = dataset.cfg.get('num_preprocess_workers', 0)
+            if len(uncached) > 0 and num_workers > 0:
+                # Preprocess the samples in parallel, the workers write the
+                # cache files and the data is read from them afterwards. Only
+                # what the workers need is sent, not the whole dataloader.
+                with Pool(num_workers,
+                          initializer=_init_cache_worker,
+                          initargs=(dataset, preprocess, cache_dir,
+                                    cache_key)) as pool:
+                    names = list(
+                        tqdm(pool.imap_unordered(_cache_sample, uncached),
+                             total=len(uncached),
+                             desc='preprocess'))
+                self.cache_convert.cached_ids += names
+            elif len(uncached) > 0:
                 for idx in tqdm(range(len(dataset)), desc='preprocess'):
                     attr = dataset.get_attr(idx)
                     name = attr['name']
@@ -100,3 +115,24 @@ class TorchDataloader(Dataset):
         else:
             steps_per_epoch = len(self.dataset)
         return steps_per_epoch
+
+
+_cache_worker_dataset = None
+_cache_worker_convert = None
+
+
+def _init_cache_worker(dataset, preprocess, cache_dir, cache_key):
+    """Sets up the dataset and cache in a preprocessing worker process."""
+    global _cache_worker_dataset, _cache_worker_convert
+    _cache_worker_dataset = dataset
+    _cache_worker_convert = Cache(preprocess,
+                                  cache_dir=cache_dir,
+                                  cache_key=cache_key)
+
+
+def _cache_sample(idx):
+    """Preprocesses and caches a sample in a preprocessing worker process."""
+    attr = _cache_worker_dataset.get_attr(idx)
+    _cache_worker_convert(attr['name'], _cache_worker_dataset.get_data(idx),
+                          attr)
+    return attr['name']
@@ -383,9 +383,8 @@ class KPFCNN(BaseModel):
         data['search_tree'] = search_tree
 
         if split in ["test", "testing", "validation", "valid"]:
-            proj_inds = np.squeeze(
-                search_tree.query(points, return_distance=False))
-            proj_inds = proj_inds.astype(np.int32)
+            proj_inds = DataProcessing.knn_search(sub_points, points, 1)
+            proj_inds = np.squeeze(proj_inds, axis=1)
             data['proj_inds'] = proj_inds
 
         return data
@@ -865,19 +864,18 @@ def global_average(x, batch_lengths):
     Returns:
         [B, D] averaged features
     """
-    # Loop over the clouds of the batch
-    averaged_features = []
-    i0 = 0
-    for b_i, length in enumerate(batch_lengths):
+    batch_lengths = torch.as_tensor(batch_lengths, device=x.device).long()
 
-        # Average features for each batch cloud
-        averaged_features.append(torch.mean(x[i0:i0 + length], dim=0))
+    # Cloud index of every point, the points of a cloud are contiguous
+    batch_ids = torch.repeat_interleave(
+        torch.arange(batch_lengths.shape[0], device=x.device), batch_lengths)
 
-        # Increment for next cloud
-        i0 += length
+    # Sum the features of all clouds in a single pass
+    summed_features = x.new_zeros((batch_lengths.shape[0], x.shape[1]))
+    summed_features.index_add_(0, batch_ids, x)
 
     # Average features in each batch
-    return torch.stack(averaged_features)
+    return summed_features / batch_lengths.unsqueeze(1).to(x.dtype)
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -881,13 +881,6 @@ class RCNN(nn.Module):
                     nn.init.constant_(m.bias, 0)
         nn.init.normal_(self.reg_blocks[-1].weight, mean=0, std=0.001)
 
-    def _break_up_pc(self, pc):
-        xyz = pc[..., 0:3].contiguous()
-        features = (pc[..., 3:].transpose(1, 2).contiguous()
-                    if pc.size(-1) > 3 else None)
-
-        return xyz, features
-
     def forward(self, roi_boxes3d, gt_boxes3d, rpn_xyz, rpn_features, seg_mask,
                 pts_depth):
         pts_extra_input_list = [seg_mask.unsqueeze(dim=2)]
@@ -931,7 +924,9 @@ class RCNN(nn.Module):
             pts_input = pooled_features.view(-1, pooled_features.shape[2],
                                              pooled_features.shape[3])
 
-        xyz, features = self._break_up_pc(pts_input)
+        # Only the coordinates are split off here, the features are sliced
+        # below without a separate channels-first copy.
+        xyz = pts_input[..., 0:3].contiguous()
 
         xyz_input = pts_input[..., 0:self.rcnn_input_channel].transpose(
             1, 2).unsqueeze(dim=3)
@@ -945,7 +940,10 @@ class RCNN(nn.Module):
         l_xyz, l_features = [xyz], [merged_feature.squeeze(dim=3)]
 
         for i in range(len(self.SA_modules)):
-            li_xyz, li_features = self.SA_modules[i](l_xyz[i], l_features[i])
+            new_xyz = self.SA_modules[i].reuse_fps(
+                l_xyz[i], self.SA_modules[i - 1].npoint if i > 0 else None)
+            li_xyz, li_features = self.SA_modules[i](l_xyz[i], l_features[i],
+                                                     new_xyz)
             l_xyz.append(li_xyz)
             l_features.append(li_features)
 
@@ -1,5 +1,6 @@
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 import numpy as np
 import random
 import time
@@ -197,9 +198,21 @@ class RandLANet(BaseModel):
         for i in range(cfg.num_layers):
             neighbour_idx = DataProcessing.knn_search(pc, pc, cfg.k_n)
 
-            sub_points = pc[:pc.shape[0] // cfg.sub_sampling_ratio[i], :]
-            pool_i = neighbour_idx[:pc.shape[0] // cfg.sub_sampling_ratio[i], :]
-            up_i = DataProcessing.knn_search(sub_points, pc, 1)
+            num_sub = pc.shape[0] // cfg.sub_sampling_ratio[i]
+            sub_points = pc[:num_sub, :]
+            pool_i = neighbour_idx[:num_sub, :]
+
+            # The sub-sampled points are the leading points of pc, so the
+            # nearest of them is the first one in the (sorted) neighbourhood.
+            # Only points without any in their neighbourhood are searched.
+            in_sub = neighbour_idx < num_sub
+            up_i = neighbour_idx[np.arange(pc.shape[0]),
+                                 np.argmax(in_sub, axis=1)]
+            missing = ~np.any(in_sub, axis=1)
+            if np.any(missing):
+                up_i[missing] = DataProcessing.knn_search(
+                    sub_points, pc[missing], 1)[:, 0]
+            up_i = up_i.reshape(-1, 1)
             input_points.append(pc)
             input_neighbors.append(neighbour_idx.astype(np.int64))
             input_pools.append(pool_i.astype(np.int64))
@@ -314,9 +327,8 @@ class RandLANet(BaseModel):
         data['search_tree'] = search_tree
 
         if split in ["test", "testing"]:
-            proj_inds = np.squeeze(
-                search_tree.query(points, return_distance=False))
-            proj_inds = proj_inds.astype(np.int32)
+            proj_inds = DataProcessing.knn_search(sub_points, points, 1)
+            proj_inds = np.squeeze(proj_inds, axis=1)
             data['proj_inds'] = proj_inds
 
         return data
@@ -372,25 +384,17 @@ class RandLANet(BaseModel):
 
     def forward_att_pooling(self, feature_set, name):
         # feature_set: BxdxNxK
-        batch_size = feature_set.size()[0]
-        num_points = feature_set.size()[2]
-        num_neigh = feature_set.size()[3]
-        d = feature_set.size()[1]
-
-        f_reshaped = torch.reshape(feature_set.permute(0, 2, 3, 1),
-                                   (-1, num_neigh, d))
-
+        # The dense layer is applied as a 1x1 convolution, so the features
+        # stay channels-first and are never permuted into a copy.
         m_dense = getattr(self, name + 'fc')
-        att_activation = m_dense(f_reshaped)
+        att_activation = F.conv2d(feature_set,
+                                  m_dense.weight.unsqueeze(-1).unsqueeze(-1),
+                                  m_dense.bias)
 
-        m_softmax = nn.Softmax(dim=1)
-        att_scores = m_softmax(att_activation)
+        att_scores = F.softmax(att_activation, dim=3)
 
-        # print("att_scores = ", att_scores.shape)
-        f_agg = f_reshaped * att_scores
-        f_agg = torch.sum(f_agg, dim=1, keepdim=True)
-        f_agg = torch.reshape(f_agg, (batch_size, num_points, 1, d))
-        f_agg = f_agg.permute(0, 3, 1, 2)
+        f_agg = feature_set * att_scores
+        f_agg = torch.sum(f_agg, dim=3, keepdim=True)  # B d N 1
 
         m_conv2d = getattr(self, name + 'mlp')
         f_agg = m_conv2d(f_agg)
@@ -404,13 +408,7 @@ class RandLANet(BaseModel):
         xyz_tile = xyz.transpose(-2, -1).unsqueeze(-1).expand(B, 3, N, K)
         #xyz_tile = xyz.unsqueeze(2).repeat(1, 1, neigh_idx.size()[-1], 1)
 
-        relative_xyz = xyz_tile - neighbor_xyz
-        relative_dis = torch.sqrt(
-            torch.sum(torch.square(relative_xyz), dim=1, keepdim=True))
-        relative_feature = torch.cat(
-            [relative_dis, relative_xyz, xyz_tile, neighbor_xyz], axis=1)
-
-        return relative_feature
+        return relative_pos_encoding(xyz_tile, neighbor_xyz)
 
     def forward_building_block(self, xyz, feature, neigh_idx, name):
         f_xyz = self.forward_relative_pos_encoding(xyz, neigh_idx)
@@ -448,9 +446,7 @@ class RandLANet(BaseModel):
         m_conv2d = getattr(self, name + 'shortcut')
         shortcut = m_conv2d(feature)
 
-        m_leakyrelu = nn.LeakyReLU(0.2)
-
-        result = m_leakyrelu(f_pc + shortcut)
+        result = residual_leaky_relu(f_pc, shortcut)
         return result
 
     def forward(self, inputs):
@@ -569,4 +565,30 @@ class RandLANet(BaseModel):
         return interpolatedim_features
 
 
+@torch.jit.script
+def relative_pos_encoding(xyz_tile, neighbor_xyz):
+    """Relative point position encoding of RandLANet.
+
+    Scripted so that the pointwise operations are fused into fewer kernels.
+
+    Args:
+        xyz_tile: [B, 3, N, K] coordinates of the center points
+        neighbor_xyz: [B, 3, N, K] coordinates of the neighbors
+
+    Returns:
+        [B, 10, N, K] distance, relative, center and neighbor coordinates
+    """
+    relative_xyz = xyz_tile - neighbor_xyz
+    relative_dis = torch.sqrt(
+        torch.sum(torch.square(relative_xyz), dim=1, keepdim=True))
+    return torch.cat([relative_dis, relative_xyz, xyz_tile, neighbor_xyz],
+                     dim=1)
+
+
+@torch.jit.script
+def residual_leaky_relu(feature, shortcut):
+    """Fused residual sum and leaky ReLU of the dilated residual block."""
+    return torch.nn.functional.leaky_relu(feature + shortcut, 0.2)
+
+
 MODEL._register_module(RandLANet, 'torch')
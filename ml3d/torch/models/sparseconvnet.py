@@ -7,7 +7,10 @@ from ...utils import MODEL
 from ..modules.losses import filter_valid_label
 from ...datasets.augment import SemsegAugmentation
 from open3d.ml.torch.layers import SparseConv, SparseConvTranspose
-from open3d.ml.torch.ops import voxelize, reduce_subarrays_sum
+from open3d.ml.torch.ops import voxelize
+
+# preprocess() keeps points inside [0, MAX_GRID_SIZE) along every axis.
+MAX_GRID_SIZE = 4096
 
 
 class SparseConvUnet(BaseModel):
@@ -123,7 +126,7 @@ class SparseConvUnet(BaseModel):
                 grid_size - M + m + 0.001, None, 0) * np.random.rand(3)
 
         points += offset
-        idxs = (points.min(1) >= 0) * (points.max(1) < 4096)
+        idxs = (points.min(1) >= 0) * (points.max(1) < MAX_GRID_SIZE)
 
         points = points[idxs]
         feat = feat[idxs]
@@ -285,31 +288,33 @@ class InputLayer(nn.Module):
         features = features[v.voxel_point_indices]
 
         # Find reverse mapping.
-        reverse_map_voxelize = np.zeros((in_positions.shape[0],))
-        reverse_map_voxelize[v.voxel_point_indices.cpu().numpy()] = np.arange(
-            in_positions.shape[0])
-        reverse_map_voxelize = reverse_map_voxelize.astype(np.int32)
+        reverse_map_voxelize = torch.empty_like(v.voxel_point_indices)
+        reverse_map_voxelize[v.voxel_point_indices] = torch.arange(
+            in_positions.shape[0],
+            dtype=reverse_map_voxelize.dtype,
+            device=reverse_map_voxelize.device)
 
         # Unique positions.
         in_positions = in_positions[v.voxel_point_row_splits[:-1]]
 
         # Mean of features.
         count = v.voxel_point_row_splits[1:] - v.voxel_point_row_splits[:-1]
-        reverse_map_sort = np.repeat(np.arange(count.shape[0]),
-                                     count.cpu().numpy()).astype(np.int32)
 
-        features_avg = in_positions.clone()
-        features_avg[:, 0] = reduce_subarrays_sum(features[:, 0],
-                                                  v.voxel_point_row_splits)
-        features_avg[:, 1] = reduce_subarrays_sum(features[:, 1],
-                                                  v.voxel_point_row_splits)
-        features_avg[:, 2] = reduce_subarrays_sum(features[:, 2],
-                                                  v.voxel_point_row_splits)
+        # Voxel index of every point, points of a voxel are contiguous.
+        voxel_ids = torch.zeros((features.shape[0],),
+                                dtype=torch.int64,
+                                device=features.device)
+        voxel_ids[v.voxel_point_row_splits[1:-1]] = 1
+        voxel_ids = torch.cumsum(voxel_ids, 0)
+
+        # Sum all feature channels of each voxel in a single pass.
+        features_avg = features.new_zeros(
+            (in_positions.shape[0], features.shape[1]))
+        features_avg.index_add_(0, voxel_ids, features)
 
         features_avg = features_avg / count.unsqueeze(1)
 
-        return features_avg, in_positions, reverse_map_sort[
-            reverse_map_voxelize]
+        return features_avg, in_positions, voxel_ids[reverse_map_voxelize]
 
 
 class OutputLayer(nn.Module):
@@ -318,10 +323,17 @@ class OutputLayer(nn.Module):
         super(OutputLayer, self).__init__()
 
     def forward(self, features_list, index_map_list):
-        out = []
+        if len(features_list) == 1:
+            return features_list[0][index_map_list[0]]
+
+        # Gather the points of all clouds with a single indexing op instead
+        # of gathering every cloud and concatenating the results.
+        offset = 0
+        index_maps = []
         for feat, index_map in zip(features_list, index_map_list):
-            out.append(feat[index_map])
-        return torch.cat(out, 0)
+            index_maps.append(index_map + offset)
+            offset += feat.shape[0]
+        return torch.cat(features_list, 0)[torch.cat(index_maps, 0)]
 
 
 class SubmanifoldSparseConv(nn.Module):
@@ -357,17 +369,58 @@ class SubmanifoldSparseConv(nn.Module):
         if out_positions_list is None:
             out_positions_list = in_positions_list
 
-        out_feat = []
-        for feat, in_pos, out_pos in zip(features_list, in_positions_list,
-                                         out_positions_list):
-            out_feat.append(self.net(feat, in_pos, out_pos, voxel_size))
-
-        return out_feat
+        return batched_sparse_conv(self.net, features_list, in_positions_list,
+                                   out_positions_list, voxel_size)
 
     def __name__(self):
         return "SubmanifoldSparseConv"
 
 
+def batched_sparse_conv(net, features_list, in_positions_list,
+                        out_positions_list, voxel_size):
+    """Applies a sparse convolution to all point clouds of a batch at once.
+
+    The clouds are concatenated and shifted apart along the x axis, so that no
+    kernel reaches across clouds. This replaces a neighbor search and a
+    convolution call per cloud with a single one.
+
+    Args:
+        net: SparseConv or SparseConvTranspose layer.
+        features_list: List of input features, one per cloud.
+        in_positions_list: List of input positions, one per cloud.
+        out_positions_list: List of output positions, one per cloud.
+        voxel_size: Voxel size passed to the layer.
+
+    Returns:
+        List of output features, one per cloud.
+    """
+    if len(features_list) == 1:
+        feat = features_list[0]
+        in_pos = in_positions_list[0]
+        out_pos = out_positions_list[0]
+    else:
+        # Input positions lie inside the grid used by preprocess(), so a
+        # shift of twice the grid size keeps the clouds out of reach.
+        shift = in_positions_list[0].new_tensor([2 * MAX_GRID_SIZE, 0, 0])
+
+        feat = torch.cat(features_list, 0)
+        in_pos = torch.cat(
+            [pos + i * shift for i, pos in enumerate(in_positions_list)], 0)
+        out_pos = torch.cat(
+            [pos + i * shift for i, pos in enumerate(out_positions_list)], 0)
+
+    # The Open3D sparse convolution has no half precision kernels, so it
+    # always runs in fp32, also under mixed precision training.
+    with torch.cuda.amp.autocast(enabled=False):
+        out = net(feat.float(), in_pos.float(), out_pos.float(), voxel_size)
+
+    if len(features_list) == 1:
+        return [out]
+
+    lengths = [pos.shape[0] for pos in out_positions_list]
+    return list(torch.split(out, lengths))
+
+
 def calculate_grid(in_positions):
     filter = torch.Tensor([[-1, -1, -1], [-1, -1, 0], [-1, 0, -1], [-1, 0, 0],
                            [0, -1, -1], [0, -1, 0], [0, 0, -1],
@@ -414,10 +467,9 @@ class Convolution(nn.Module):
         for in_positions in in_positions_list:
             out_positions_list.append(calculate_grid(in_positions))
 
-        out_feat = []
-        for feat, in_pos, out_pos in zip(features_list, in_positions_list,
-                                         out_positions_list):
-            out_feat.append(self.net(feat, in_pos, out_pos, voxel_size))
+        out_feat = batched_sparse_conv(self.net, features_list,
+                                       in_positions_list, out_positions_list,
+                                       voxel_size)
 
         out_positions_list = [out / 2 for out in out_positions_list]
 
@@ -457,12 +509,8 @@ class DeConvolution(nn.Module):
                 in_positions_list,
                 out_positions_list,
                 voxel_size=1.0):
-        out_feat = []
-        for feat, in_pos, out_pos in zip(features_list, in_positions_list,
-                                         out_positions_list):
-            out_feat.append(self.net(feat, in_pos, out_pos, voxel_size))
-
-        return out_feat
+        return batched_sparse_conv(self.net, features_list, in_positions_list,
+                                   out_positions_list, voxel_size)
 
     def __name__(self):
         return "DeConvolution"
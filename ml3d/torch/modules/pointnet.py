@@ -27,7 +27,6 @@
 
 import torch
 from torch import nn
-import torch.nn.functional as F
 
 from typing import List
 
@@ -92,7 +91,10 @@ class Pointnet2MSG(nn.Module):
 
         l_xyz, l_features = [xyz], [features]
         for i in range(len(self.SA_modules)):
-            li_xyz, li_features = self.SA_modules[i](l_xyz[i], l_features[i])
+            new_xyz = self.SA_modules[i].reuse_fps(
+                l_xyz[i], self.SA_modules[i - 1].npoint if i > 0 else None)
+            li_xyz, li_features = self.SA_modules[i](l_xyz[i], l_features[i],
+                                                     new_xyz)
             l_xyz.append(li_xyz)
             l_features.append(li_features)
 
@@ -132,8 +134,10 @@ class _PointnetSAModuleBase(nn.Module):
 
         if new_xyz is None and self.npoint is not None:
             sampling = pointnet2_utils.furthest_point_sample(xyz, self.npoint)
-            new_xyz = torch.gather(xyz, 1,
-                                   torch.stack([sampling] * 3, -1).long())
+            # Expand the sampled indices over xyz as a view instead of
+            # materializing three copies of them.
+            sampling = sampling.long().unsqueeze(-1).expand(-1, -1, 3)
+            new_xyz = torch.gather(xyz, 1, sampling)
 
         for i in range(len(self.groupers)):
             new_features = self.groupers[i](xyz, new_xyz,
@@ -141,16 +145,14 @@ class _PointnetSAModuleBase(nn.Module):
 
             new_features = self.mlps[i](
                 new_features)  # (B, mlp[-1], npoint, nsample)
+            # Reduce over the fixed nsample axis directly rather than with a
+            # pooling window built from the runtime tensor shape.
             if self.pool_method == 'max_pool':
-                new_features = F.max_pool2d(new_features,
-                                            kernel_size=[
-                                                1, new_features.size(3)
-                                            ])  # (B, mlp[-1], npoint, 1)
+                new_features = new_features.max(
+                    dim=3, keepdim=True)[0]  # (B, mlp[-1], npoint, 1)
             elif self.pool_method == 'avg_pool':
-                new_features = F.avg_pool2d(new_features,
-                                            kernel_size=[
-                                                1, new_features.size(3)
-                                            ])  # (B, mlp[-1], npoint, 1)
+                new_features = new_features.mean(
+                    dim=3, keepdim=True)  # (B, mlp[-1], npoint, 1)
             else:
                 raise NotImplementedError
 
@@ -159,6 +161,27 @@ class _PointnetSAModuleBase(nn.Module):
 
         return new_xyz, torch.cat(new_features_list, dim=1)
 
+    def reuse_fps(self, xyz, prev_npoint):
+        """Reuses a previous furthest point sampling of the input points.
+
+        Furthest point sampling is greedy and starts from the first point, so
+        sampling npoint points from the output of an earlier sampling returns
+        its first npoint points. This skips the sampling kernel for stacked
+        set abstraction layers.
+
+        :param xyz: (B, N, 3) output of the previous set abstraction layer
+        :param prev_npoint: npoint of the previous layer, None if it did not
+            sample
+        :return:
+            new_xyz: (B, npoint, 3) centroids, or None if they cannot be reused
+        """
+        if prev_npoint is None or self.npoint is None:
+            return None
+        if not 0 < self.npoint <= prev_npoint:
+            return None
+
+        return xyz[:, :self.npoint, :].contiguous()
+
 
 class PointnetSAModuleMSG(_PointnetSAModuleBase):
     """Pointnet set abstraction layer with multiscale grouping."""
@@ -302,13 +302,17 @@ class ObjectDetection(BasePipeline):
                     torch.nn.utils.clip_grad_value_(model.parameters(),
                                                     model.cfg.grad_clip_norm)
                 self.optimizer.step()
+                # Copy all loss values to the host at once, a copy per value
+                # would synchronize with the device every time.
+                loss_values = torch.stack([v.detach() for v in loss.values()
+                                          ]).cpu().numpy()
                 desc = "training - "
-                for l, v in loss.items():
+                for l, v in zip(loss.keys(), loss_values):
                     if not l in self.losses:
                         self.losses[l] = []
-                    self.losses[l].append(v.cpu().detach().numpy())
-                    desc += " %s: %.03f" % (l, v.cpu().detach().numpy())
-                desc += " > loss: %.03f" % loss_sum.cpu().detach().numpy()
+                    self.losses[l].append(v)
+                    desc += " %s: %.03f" % (l, v)
+                desc += " > loss: %.03f" % loss_values.sum()
                 process_bar.set_description(desc)
                 process_bar.refresh()
 
@@ -81,6 +81,8 @@ class SemanticSegmentation(BasePipeline):
             device: The device to be used for training.
             split: The dataset split to be used. In this example, we have used "train".
             train_sum_dir: The directory where the trainig summary is stored.
+            mixed_precision: Whether to train with automatic mixed precision. Only used on CUDA devices.
+            compile: Whether to compile the model with torch.compile for training. Requires PyTorch 2.0 or later.
 
     **Returns:**
             class: The corresponding class.
@@ -360,6 +362,20 @@ class SemanticSegmentation(BasePipeline):
 
         self.optimizer, self.scheduler = model.get_optimizer(cfg)
 
+        # The compiled module shares its parameters with the model, which is
+        # still used for checkpoints. Shapes are dynamic since the number of
+        # points differs between layers.
+        net = model
+        if cfg.get('compile', False):
+            if not hasattr(torch, 'compile'):
+                raise RuntimeError("compile requires PyTorch 2.0 or later.")
+            net = torch.compile(model, dynamic=True)
+
+        # Mixed precision is only supported on CUDA devices. The loss scaler
+        # and autocast are no-ops when it is disabled.
+        use_amp = cfg.get('mixed_precision', False) and device.type == 'cuda'
+        self.scaler = torch.cuda.amp.GradScaler(enabled=use_amp)
+
         is_resume = model.cfg.get('is_resume', True)
         self.load_ckpt(model.cfg.ckpt_path, is_resume=is_resume)
 
@@ -390,18 +406,21 @@ class SemanticSegmentation(BasePipeline):
                 if hasattr(inputs['data'], 'to'):
                     inputs['data'].to(device)
                 self.optimizer.zero_grad()
-                results = model(inputs['data'])
-                loss, gt_labels, predict_scores = model.get_loss(
-                    Loss, results, inputs, device)
+                with torch.cuda.amp.autocast(enabled=use_amp):
+                    results = net(inputs['data'])
+                    loss, gt_labels, predict_scores = model.get_loss(
+                        Loss, results, inputs, device)
 
                 if predict_scores.size()[-1] == 0:
                     continue
 
-                loss.backward()
+                self.scaler.scale(loss).backward()
                 if model.cfg.get('grad_clip_norm', -1) > 0:
+                    self.scaler.unscale_(self.optimizer)
                     torch.nn.utils.clip_grad_value_(model.parameters(),
                                                     model.cfg.grad_clip_norm)
-                self.optimizer.step()
+                self.scaler.step(self.optimizer)
+                self.scaler.update()
 
                 self.metric_train.update(predict_scores, gt_labels)
 
@@ -420,9 +439,10 @@ class SemanticSegmentation(BasePipeline):
                     if hasattr(inputs['data'], 'to'):
                         inputs['data'].to(device)
 
-                    results = model(inputs['data'])
-                    loss, gt_labels, predict_scores = model.get_loss(
-                        Loss, results, inputs, device)
+                    with torch.cuda.amp.autocast(enabled=use_amp):
+                        results = net(inputs['data'])
+                        loss, gt_labels, predict_scores = model.get_loss(
+                            Loss, results, inputs, device)
 
                     if predict_scores.size()[-1] == 0:
                         continue
@@ -519,6 +539,10 @@ class SemanticSegmentation(BasePipeline):
         if 'scheduler_state_dict' in ckpt and hasattr(self, 'scheduler'):
             log.info(f'Loading checkpoint scheduler_state_dict')
             self.scheduler.load_state_dict(ckpt['scheduler_state_dict'])
+        # The scaler state is empty when saved without mixed precision.
+        if ckpt.get('scaler_state_dict') and hasattr(self, 'scaler'):
+            log.info(f'Loading checkpoint scaler_state_dict')
+            self.scaler.load_state_dict(ckpt['scaler_state_dict'])
 
     """
     Save a checkpoint at the passed epoch.
@@ -532,7 +556,8 @@ class SemanticSegmentation(BasePipeline):
             dict(epoch=epoch,
                  model_state_dict=self.model.state_dict(),
                  optimizer_state_dict=self.optimizer.state_dict(),
-                 scheduler_state_dict=self.scheduler.state_dict()),
+                 scheduler_state_dict=self.scheduler.state_dict(),
+                 scaler_state_dict=self.scaler.state_dict()),
             join(path_ckpt, f'ckpt_{epoch:05d}.pth'))
         log.info(f'Epoch {epoch:3d}: save ckpt to {path_ckpt:s}')
 
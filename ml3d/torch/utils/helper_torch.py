@@ -3,7 +3,83 @@ import torch.nn as nn
 import torch.nn.functional as F
 
 
-class conv2d_transpose(nn.Module):
+def fold_batch_norm(weight, bias, bn, dim=0):
+    """Folds an eval-mode batch norm into the preceding convolution.
+
+    Args:
+        weight: Weight of the convolution.
+        bias: Bias of the convolution or None.
+        bn: BatchNorm layer applied to the convolution output.
+        dim: Output channel dimension of the weight.
+
+    Returns:
+        The folded weight and bias.
+    """
+    scale = bn.weight * torch.rsqrt(bn.running_var + bn.eps)
+    shape = [1] * weight.dim()
+    shape[dim] = -1
+    if bias is None:
+        bias = torch.zeros_like(bn.running_mean)
+    bias = (bias - bn.running_mean) * scale + bn.bias
+    return weight * scale.view(shape), bias
+
+
+class _BatchNormFolding(nn.Module):
+    """Folds the batch norm into the convolution while in eval mode.
+
+    With gradients enabled the fold is computed on every call, so gradients
+    reach the convolution and batch norm parameters. Without gradients the
+    folded weight and bias are cached. The cache is computed when switching
+    to eval mode and refreshed whenever one of the folded tensors has been
+    modified in place, e.g. by an optimizer step.
+    """
+
+    # Output channel dimension of the convolution weight.
+    fold_dim = 0
+
+    def train(self, mode=True):
+        super().train(mode)
+        self._folded = None
+        if self.batchNorm and not mode:
+            self._folded = self._fold()
+        return self
+
+    def _fold_versions(self):
+        """In-place modification counters of the folded tensors."""
+        bn = self.batch_normalization
+        tensors = [
+            self.conv.weight, self.conv.bias, bn.weight, bn.bias,
+            bn.running_mean, bn.running_var
+        ]
+        return [t._version for t in tensors if t is not None]
+
+    def _fold(self):
+        versions = self._fold_versions()
+        with torch.no_grad():
+            weight, bias = fold_batch_norm(self.conv.weight, self.conv.bias,
+                                           self.batch_normalization,
+                                           self.fold_dim)
+        return weight, bias, versions
+
+    def _folded_parameters(self):
+        if torch.is_grad_enabled():
+            return fold_batch_norm(self.conv.weight, self.conv.bias,
+                                   self.batch_normalization, self.fold_dim)
+
+        if self._folded is None or self._folded[2] != self._fold_versions():
+            self._folded = self._fold()
+        return self._folded[:2]
+
+    def _apply(self, fn):
+        self._folded = None
+        return super()._apply(fn)
+
+    def _load_from_state_dict(self, *args, **kwargs):
+        self._folded = None
+        super()._load_from_state_dict(*args, **kwargs)
+
+
+class conv2d_transpose(_BatchNormFolding):
 
     def __init__(self,
                  batchNorm,
@@ -13,6 +89,8 @@ class conv2d_transpose(nn.Module):
                  stride=1,
                  activation=True):
         super(conv2d_transpose, self).__init__()
+        self.fold_dim = 1
+        self._folded = None
         self.conv = nn.ConvTranspose2d(in_planes,
                                        out_planes,
                                        kernel_size=kernel_size,
@@ -32,14 +110,21 @@ class conv2d_transpose(nn.Module):
             self.activation_fn = nn.Identity()
 
     def forward(self, x):
-        x = self.conv(x)
-        if self.batchNorm:
-            x = self.batch_normalization(x)
+        if self.batchNorm and not self.training:
+            # The batch norm is folded into the convolution parameters.
+            weight, bias = self._folded_parameters()
+            x = F.conv_transpose2d(x, weight, bias, self.conv.stride,
+                                   self.conv.padding, self.conv.output_padding,
+                                   self.conv.groups, self.conv.dilation)
+        else:
+            x = self.conv(x)
+            if self.batchNorm:
+                x = self.batch_normalization(x)
         x = self.activation_fn(x)
         return x
 
 
-class conv2d(nn.Module):
+class conv2d(_BatchNormFolding):
 
     def __init__(self,
                  batchNorm,
@@ -49,6 +134,7 @@ class conv2d(nn.Module):
                  stride=1,
                  activation=True):
         super(conv2d, self).__init__()
+        self._folded = None
         self.conv = nn.Conv2d(in_planes,
                               out_planes,
                               kernel_size=kernel_size,
@@ -68,8 +154,14 @@ class conv2d(nn.Module):
             self.activation_fn = nn.Identity()
 
     def forward(self, x):
-        x = self.conv(x)
-        if self.batchNorm:
-            x = self.batch_normalization(x)
+        if self.batchNorm and not self.training:
+            # The batch norm is folded into the convolution parameters.
+            weight, bias = self._folded_parameters()
+            x = F.conv2d(x, weight, bias, self.conv.stride, self.conv.padding,
+                         self.conv.dilation, self.conv.groups)
+        else:
+            x = self.conv(x)
+            if self.batchNorm:
+                x = self.batch_normalization(x)
         x = self.activation_fn(x)
         return x
@@ -27,7 +27,6 @@
 
 import torch
 import torch.nn as nn
-import torch.nn.functional as F
 
 from . import pointnet2_utils
 from . import pytorch_utils as pt_utils
@@ -60,8 +59,10 @@ class _PointnetSAModuleBase(nn.Module):
 
         if new_xyz is None and self.npoint is not None:
             sampling = pointnet2_utils.furthest_point_sample(xyz, self.npoint)
-            new_xyz = torch.gather(xyz, 1,
-                                   torch.stack([sampling] * 3, -1).long())
+            # Expand the sampled indices over xyz as a view instead of
+            # materializing three copies of them.
+            sampling = sampling.long().unsqueeze(-1).expand(-1, -1, 3)
+            new_xyz = torch.gather(xyz, 1, sampling)
 
         for i in range(len(self.groupers)):
             new_features = self.groupers[i](xyz, new_xyz,
@@ -69,16 +70,14 @@ class _PointnetSAModuleBase(nn.Module):
 
             new_features = self.mlps[i](
                 new_features)  # (B, mlp[-1], npoint, nsample)
+            # Reduce over the fixed nsample axis directly rather than with a
+            # pooling window built from the runtime tensor shape.
             if self.pool_method == 'max_pool':
-                new_features = F.max_pool2d(new_features,
-                                            kernel_size=[
-                                                1, new_features.size(3)
-                                            ])  # (B, mlp[-1], npoint, 1)
+                new_features = new_features.max(
+                    dim=3, keepdim=True)[0]  # (B, mlp[-1], npoint, 1)
             elif self.pool_method == 'avg_pool':
-                new_features = F.avg_pool2d(new_features,
-                                            kernel_size=[
-                                                1, new_features.size(3)
-                                            ])  # (B, mlp[-1], npoint, 1)
+                new_features = new_features.mean(
+                    dim=3, keepdim=True)  # (B, mlp[-1], npoint, 1)
             else:
                 raise NotImplementedError
 
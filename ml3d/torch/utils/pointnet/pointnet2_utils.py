@@ -206,31 +206,28 @@ class QueryAndGroup(nn.Module):
 
         batch_size = xyz.shape[0]
 
+        # Cast the indices once, they are expanded over the channels as a view.
         idx = ball_query_gpu(self.radius, self.nsample, xyz, new_xyz)
-        idx_stacked = torch.stack([idx] * 3, dim=1).view(batch_size, 3,
-                                                         -1).long()
-
-        xyz_trans = xyz.transpose(1, 2).contiguous()
-        grouped_xyz = torch.gather(xyz_trans, dim=2, index=idx_stacked).view(
-            batch_size, 3, -1, self.nsample)  # (B, 3, npoint, nsample)
-        grouped_xyz -= new_xyz.transpose(1, 2).unsqueeze(-1)
+        idx = idx.long().view(batch_size, 1, -1)
 
+        xyz_trans = xyz.transpose(1, 2)
         if features is not None:
-            idx_stacked = torch.stack([idx] * features.shape[1],
-                                      dim=1).view(batch_size, features.shape[1],
-                                                  -1).long()
-            grouped_features = torch.gather(features, dim=2,
-                                            index=idx_stacked).view(
-                                                batch_size, features.shape[1],
-                                                -1, self.nsample)
             if self.use_xyz:
-                new_features = torch.cat([grouped_xyz, grouped_features],
-                                         dim=1)  # (B, C + 3, npoint, nsample)
-            else:
-                new_features = grouped_features
+                # Group coordinates and features with a single gather.
+                features = torch.cat([xyz_trans, features],
+                                     dim=1)  # (B, 3 + C, N)
         else:
             assert self.use_xyz, "Cannot have not features and not use xyz as a feature!"
-            new_features = grouped_xyz
+            features = xyz_trans
+
+        channels = features.shape[1]
+        new_features = torch.gather(features,
+                                    dim=2,
+                                    index=idx.expand(-1, channels, -1)).view(
+                                        batch_size, channels, -1,
+                                        self.nsample)  # (B, C, npoint, nsample)
+        if self.use_xyz:
+            new_features[:, :3] -= new_xyz.transpose(1, 2).unsqueeze(-1)
 
         return new_features
 
@@ -61,7 +61,7 @@ class Cache(object):
         else:
             output = self._read(fpath)
 
-        return self._read(fpath)
+        return output
 
     def _write(self, x, fpath):
         np.save(fpath, x)
@@ -0,0 +1,51 @@
+import pytest
+import os
+import numpy as np
+
+
+class RandomSplit:
+    """Minimal dataset split with random point clouds."""
+
+    def __init__(self, cfg, points):
+        self.cfg = cfg
+        self.points = points
+
+    def __len__(self):
+        return len(self.points)
+
+    def get_data(self, idx):
+        return {'point': self.points[idx]}
+
+    def get_attr(self, idx):
+        return {'name': 'sample_{}'.format(idx), 'split': 'train'}
+
+
+def preprocess(data, attr):
+    return {'point': data['point'] * 2}
+
+
+def test_torch_dataloader_cache_workers(tmp_path):
+    from open3d.ml.utils import Config
+    from open3d.ml.torch.dataloaders import TorchDataloader
+
+    points = [np.random.random((100, 3)).astype(np.float32) for _ in range(6)]
+
+    loaders = []
+    for num_workers in [0, 2]:
+        cfg = Config({
+            'cache_dir': str(tmp_path / str(num_workers)),
+            'num_preprocess_workers': num_workers
+        })
+        loaders.append(
+            TorchDataloader(dataset=RandomSplit(cfg, points),
+                            preprocess=preprocess))
+    serial, parallel = loaders
+
+    assert sorted(serial.cache_convert.cached_ids) == sorted(
+        parallel.cache_convert.cached_ids)
+    assert sorted(os.listdir(serial.cache_convert.cache_dir)) == sorted(
+        os.listdir(parallel.cache_convert.cache_dir))
+
+    for idx in range(len(points)):
+        assert np.array_equal(serial[idx]['data']['point'],
+                              parallel[idx]['data']['point'])
@@ -1,5 +1,6 @@
 import pytest
 import os
+import importlib
 import numpy as np
 import torch
 import tensorflow as tf
@@ -10,6 +11,14 @@ else:
     base = '.'
 
 
+def ml3d_module(name):
+    """Imports a submodule of Open3D-ML, e.g. 'torch.utils.helper_torch'."""
+    import open3d.ml.torch as ml3d
+
+    package = ml3d.models.RandLANet.__module__.rsplit('.torch.', 1)[0]
+    return importlib.import_module(package + '.' + name)
+
+
 def test_randlanet_torch():
     import open3d.ml.torch as ml3d
 
@@ -48,6 +57,44 @@ def test_randlanet_torch():
     assert out.shape == (1, 5000, 10)
 
 
+def test_randlanet_up_sampling_torch():
+    import open3d.ml.torch as ml3d
+    DataProcessing = ml3d_module('datasets.utils').DataProcessing
+
+    # A small k_n leaves some points without sub-sampled neighbours, which
+    # exercises the fallback search as well.
+    net = ml3d.models.RandLANet(num_points=5000,
+                                num_classes=10,
+                                dim_input=6,
+                                k_n=4)
+    net.device = 'cpu'
+
+    data = {
+        'point': np.array(np.random.random((5000, 3)), dtype=np.float32),
+        'feat': np.array(np.random.random((5000, 3)), dtype=np.float32),
+        'label': np.zeros((5000,), dtype=np.int32)
+    }
+    attr = {'split': 'test'}
+
+    data = net.preprocess(data, attr)
+    inputs = net.transform(data, attr)
+
+    fallback = False
+    for i in range(net.cfg.num_layers):
+        pc = inputs['xyz'][i]
+        num_sub = pc.shape[0] // net.cfg.sub_sampling_ratio[i]
+        sub_points = pc[:num_sub]
+        fallback |= np.any(np.all(inputs['neigh_idx'][i] >= num_sub, axis=1))
+
+        up_i = inputs['interp_idx'][i][:, 0]
+        knn_i = DataProcessing.knn_search(sub_points, pc, 1)[:, 0]
+        dist = np.linalg.norm(pc - sub_points[up_i], axis=1)
+        knn_dist = np.linalg.norm(pc - sub_points[knn_i], axis=1)
+        assert np.allclose(dist, knn_dist, atol=1e-6)
+
+    assert fallback
+
+
 def test_randlanet_tf():
     import open3d.ml.tf as ml3d
 
@@ -194,3 +241,167 @@ def test_pointpillars_tf():
     boxes = net.inference_end(results, data)
 
     assert type(boxes) == list
+
+
+def test_conv2d_batch_norm_folding_torch():
+    helper_torch = ml3d_module('torch.utils.helper_torch')
+
+    layers = [
+        helper_torch.conv2d(True, 4, 8, kernel_size=3),
+        helper_torch.conv2d_transpose(True, 4, 8, kernel_size=3, stride=2)
+    ]
+    x = torch.rand(2, 4, 16, 16)
+
+    for layer in layers:
+        bn = layer.batch_normalization
+        with torch.no_grad():
+            bn.running_mean.uniform_(-1, 1)
+            bn.running_var.uniform_(0.5, 2)
+            bn.weight.uniform_(0.5, 2)
+            bn.bias.uniform_(-1, 1)
+
+        layer.eval()
+        with torch.no_grad():
+            out = layer(x)
+            expected = layer.activation_fn(bn(layer.conv(x)))
+        assert np.allclose(out.numpy(), expected.numpy(), atol=1e-5)
+
+        # The folded parameters follow newly loaded weights.
+        state = {
+            k: v + 0.5 if v.is_floating_point() else v
+            for k, v in layer.state_dict().items()
+        }
+        layer.load_state_dict(state)
+        with torch.no_grad():
+            out = layer(x)
+            expected = layer.activation_fn(bn(layer.conv(x)))
+        assert np.allclose(out.numpy(), expected.numpy(), atol=1e-5)
+
+        # Gradients reach the convolution and batch norm in eval mode, and
+        # an optimizer step refreshes the cached fold.
+        optimizer = torch.optim.SGD(layer.parameters(), lr=0.1)
+        layer(x).sum().backward()
+        assert layer.conv.weight.grad is not None
+        assert bn.weight.grad is not None
+        optimizer.step()
+        with torch.no_grad():
+            out = layer(x)
+            expected = layer.activation_fn(bn(layer.conv(x)))
+        assert np.allclose(out.numpy(), expected.numpy(), atol=1e-5)
+
+        layer.train()
+        assert layer._folded is None
+
+
+def test_sparseconvnet_batched_conv_torch():
+    sparseconvnet = ml3d_module('torch.models.sparseconvnet')
+
+    # Two clouds at opposite ends of the grid, so any kernel reaching across
+    # the batched clouds changes the result.
+    pos_list = []
+    for start in [sparseconvnet.MAX_GRID_SIZE - 32, 0]:
+        pos = np.unique(np.random.randint(0, 32, (500, 3)), axis=0) + start
+        pos_list.append(torch.from_numpy(pos.astype(np.float32) + 0.5))
+    feat_list = [torch.rand(pos.shape[0], 4) for pos in pos_list]
+
+    sub_conv = sparseconvnet.SubmanifoldSparseConv(4, 8, [3, 3, 3])
+    conv = sparseconvnet.Convolution(4, 8, [2, 2, 2])
+    deconv = sparseconvnet.DeConvolution(8, 4, [2, 2, 2])
+
+    with torch.no_grad():
+        out_list = sub_conv(feat_list, pos_list)
+        for feat, pos, out in zip(feat_list, pos_list, out_list):
+            expected = sub_conv.net(feat, pos, pos, 1.0)
+            assert np.allclose(out.numpy(), expected.numpy(), atol=1e-5)
+
+        down_list, down_pos_list = conv(feat_list, pos_list)
+        for feat, pos, out in zip(feat_list, pos_list, down_list):
+            expected = conv.net(feat, pos, sparseconvnet.calculate_grid(pos),
+                                1.0)
+            assert np.allclose(out.numpy(), expected.numpy(), atol=1e-5)
+
+        # Like UNet, scale the down-sampled positions back to the input grid.
+        down_pos_list = [2 * pos for pos in down_pos_list]
+        up_list = deconv(down_list, down_pos_list, pos_list)
+        for feat, down_pos, pos, out in zip(down_list, down_pos_list, pos_list,
+                                            up_list):
+            expected = deconv.net(feat, down_pos, pos, 1.0)
+            assert np.allclose(out.numpy(), expected.numpy(), atol=1e-5)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason='requires CUDA')
+def test_pointnet_reuse_fps_torch():
+    pointnet = ml3d_module('torch.modules.pointnet')
+    pointnet2_utils = ml3d_module('torch.utils.pointnet.pointnet2_utils')
+
+    def sample(xyz, npoint):
+        idx = pointnet2_utils.furthest_point_sample(xyz, npoint)
+        return torch.gather(xyz, 1, idx.long().unsqueeze(-1).expand(-1, -1, 3))
+
+    xyz = torch.rand(2, 4096, 3, device='cuda')
+    xyz_fps = sample(xyz, 512)
+
+    module = pointnet.PointnetSAModule(mlp=[0, 16],
+                                       npoint=128,
+                                       radius=0.2,
+                                       nsample=16)
+    new_xyz = module.reuse_fps(xyz_fps, 512)
+
+    assert torch.equal(new_xyz, sample(xyz_fps, 128))
+
+
+def test_sparseconvnet_input_output_layers_torch():
+    sparseconvnet = ml3d_module('torch.models.sparseconvnet')
+
+    # Few voxels for many points, so most voxels hold several points.
+    voxels = np.random.randint(0, 6, (1000, 3))
+    pos = voxels + 0.9 * np.random.random((1000, 3))
+    pos = torch.from_numpy(pos.astype(np.float32))
+    feat = torch.rand(1000, 5)
+
+    feat_avg, voxel_pos, index_map = sparseconvnet.InputLayer()(feat, pos)
+
+    voxel_ids = np.floor(voxel_pos.numpy()).astype(np.int64)
+    assert len(np.unique(voxel_ids, axis=0)) == len(voxel_ids)
+    # Every point maps to its own voxel.
+    assert np.array_equal(voxel_ids[index_map.numpy()], voxels)
+    # Every voxel holds the mean of the features of its points.
+    for i, voxel in enumerate(voxel_ids):
+        mask = np.all(voxels == voxel, axis=1)
+        assert np.allclose(feat_avg[i].numpy(),
+                           feat.numpy()[mask].mean(0),
+                           atol=1e-5)
+
+    # The single gather of OutputLayer matches gathering every cloud.
+    feat_list = [torch.rand(50, 5), torch.rand(80, 5)]
+    index_map_list = [
+        torch.randint(0, 50, (200,)),
+        torch.randint(0, 80, (300,))
+    ]
+    out = sparseconvnet.OutputLayer()(feat_list, index_map_list)
+    expected = torch.cat(
+        [f[index_map] for f, index_map in zip(feat_list, index_map_list)], 0)
+    assert torch.equal(out, expected)
+
+
+def test_kpconv_global_average_torch():
+    kpconv = ml3d_module('torch.models.kpconv')
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+
+    lengths = [30, 1, 70, 45]
+    x = torch.rand(sum(lengths), 8, device=device)
+
+    # Per-cloud mean, as computed by the former loop.
+    expected = []
+    i0 = 0
+    for length in lengths:
+        expected.append(torch.mean(x[i0:i0 + length], dim=0))
+        i0 += length
+    expected = torch.stack(expected).cpu().numpy()
+
+    for batch_lengths in [
+            lengths,
+            torch.tensor(lengths, dtype=torch.int32, device=device)
+    ]:
+        out = kpconv.global_average(x, batch_lengths)
+        assert np.allclose(out.cpu().numpy(), expected, atol=1e-6)
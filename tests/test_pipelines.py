@@ -0,0 +1,25 @@
+import pytest
+import os
+import torch
+
+
+def test_semseg_scaler_checkpoint_torch(tmp_path):
+    import open3d.ml.torch as ml3d
+
+    model = ml3d.models.RandLANet(num_classes=10, dim_input=6)
+    pipeline = ml3d.pipelines.SemanticSegmentation(model,
+                                                   main_log_dir=str(tmp_path),
+                                                   device='cpu')
+    pipeline.optimizer, pipeline.scheduler = model.get_optimizer(pipeline.cfg)
+
+    # Training without mixed precision saves an empty scaler state.
+    pipeline.scaler = torch.cuda.amp.GradScaler(enabled=False)
+    pipeline.save_ckpt(0)
+    ckpt_path = os.path.join(pipeline.cfg.logs_dir, 'checkpoint',
+                             'ckpt_00000.pth')
+    assert torch.load(ckpt_path)['scaler_state_dict'] == {}
+
+    # Resuming from it works, also with mixed precision enabled.
+    pipeline.scaler = torch.cuda.amp.GradScaler(
+        enabled=torch.cuda.is_available())
+    pipeline.load_ckpt(ckpt_path)